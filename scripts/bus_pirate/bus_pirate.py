@@ -40,9 +40,9 @@ class BusPirate:
         self.flush()
         
         # In case the Bus Pirate is in a mode/shell
-        self.send("n")
+        self.send_raw("n\n")
         self.wait()
-        self.send("1")
+        self.send_raw("1\n")
         self.wait()
 
         # Send newlines to escape a mode config or other cmd config
@@ -58,8 +58,8 @@ class BusPirate:
         Change the Bus Pirate mode.
         - mode string: "I2C", "SPI", "UART", etc.
         """
-        self.send("m " + mode.lower())
-        self.send("\n" * 10) # select the default configuration
+        self.send_raw(f"m {mode.lower()}\n")
+        self.send_raw("\n" * 10) # select the default configuration
         self.wait()
         self.flush()
     
@@ -92,6 +92,15 @@ class BusPirate:
             data += "\n"
         self.serial.write(data.encode("utf-8"))
 
+    def send_raw(self, data: str | bytes):
+        """
+        Send data to the Bus Pirate as-is, without adding a newline.
+        - data: string or bytes, already terminated by the caller
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.serial.write(data)
+
 
     def receive(self, skip: int = 1, timeout: float = 0.5) -> list[str]:
         """
@@ -1,6 +1,9 @@
 import websocket
+import selectors
 import time
 
+_now = time.monotonic_ns
+
 class BusPirateWifi:
     """
     Class to interact with the ESP32 Bus Pirate over WiFi using the websocket connection.
@@ -16,66 +19,150 @@ class BusPirateWifi:
         self.timeout = timeout
         self.url = f"ws://{ip}/ws"
         self._buffer = bytearray()
+        self._r = 0  # read offset into _buffer
 
-        self.ws = websocket.WebSocket()
+        # Frames are handled as raw bytes, no need to validate them as UTF-8
+        self.ws = websocket.WebSocket(skip_utf8_validation=True)
         self.ws.settimeout(timeout)
+        self._cur_timeout = timeout  # last value given to ws.settimeout
         self.ws.connect(self.url)
 
+        # Bound once, these are hit on every pull and send
+        self._ws_recv = self.ws.recv
+        self._ws_send = self.ws.send
+        self._ws_settimeout = self.ws.settimeout
+
+        # Registered once so idle waits are a single epoll/kqueue call
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self.ws.sock, selectors.EVENT_READ)
+
     def _pull_data(self, timeout: float = 0.1):
         """
-        Pull any available data from the websocket into the internal buffer.
+        Pull a single websocket frame (if one arrives within `timeout`)
+        into the internal buffer.
         """
-        old_timeout = self.ws.gettimeout()
-        self.ws.settimeout(timeout)
+        data = self._recv_frame(timeout)
+        if data:
+            self._buffer += data
+
+    def _set_timeout(self, timeout: float):
+        """
+        Set the websocket timeout, skipping the call if it is already set.
+        """
+        if timeout != self._cur_timeout:
+            self._ws_settimeout(timeout)
+            self._cur_timeout = timeout
+
+    def _recv_frame(self, timeout: float = 0.1) -> bytes:
+        """
+        Receive a single websocket frame as bytes.
+        Blocks on the socket until a frame arrives or `timeout` expires,
+        returning b"" if nothing arrived.
+        """
+        if not self._sel.select(timeout):
+            return b""
+
+        # Only bounds reading the rest of a frame once the socket is readable
+        self._set_timeout(self.timeout)
         try:
-            while True:
-                try:
-                    data = self.ws.recv()
-                    if data:
-                        if isinstance(data, str):
-                            data = data.encode("utf-8")
-                        self._buffer += data
-                    else:
-                        break
-                except websocket.WebSocketTimeoutException:
-                    break
-        finally:
-            self.ws.settimeout(old_timeout)
+            data = self._ws_recv()
+        except websocket.WebSocketTimeoutException:
+            return b""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return data
 
-    def _readline(self, timeout: float = 0.5) -> bytes:
+    def _pull_into(self, dst: bytearray, timeout: float = 0.1):
+        """
+        Pull data from the websocket for at most `timeout` seconds,
+        appending it to `dst`, so a steady stream cannot keep it draining.
+        """
+        deadline_ns = _now() + int(timeout * 1e9)
+        while True:
+            data = self._recv_frame(max(deadline_ns - _now(), 0) / 1e9)
+            if not data:
+                break
+            dst += data
+            if _now() >= deadline_ns:
+                break
+
+    def _readline(self, timeout: float = 0.5, partial: bool = True) -> bytes:
         """
         Read a single line (ending with \\n) from the internal buffer,
         pulling from the websocket as needed.
+        - partial: on timeout, return an incomplete line instead of b""
         """
-        deadline = time.time() + timeout
+        deadline_ns = _now() + int(timeout * 1e9)
         while True:
             # Check if buffer already contains a complete line
-            idx = self._buffer.find(b"\n")
+            idx = self._buffer.find(b"\n", self._r)
             if idx != -1:
-                line = bytes(self._buffer[: idx + 1])
-                self._buffer = self._buffer[idx + 1 :]
+                # Copy straight out of the buffer, no intermediate bytearray
+                line = memoryview(self._buffer)[self._r : idx + 1].tobytes()
+                self._r = idx + 1
+                self._compact()
                 return line
 
             # Try to pull more data from the websocket
-            remaining = deadline - time.time()
-            if remaining <= 0:
+            remaining_ns = deadline_ns - _now()
+            if remaining_ns <= 0:
                 # Timeout – return whatever partial data we have
-                if self._buffer:
-                    data = bytes(self._buffer)
+                if partial and self._r < len(self._buffer):
+                    data = bytes(self._buffer[self._r :])
                     self._buffer.clear()
+                    self._r = 0
                     return data
                 return b""
 
-            self._pull_data(timeout=min(remaining, 0.1))
+            if self._r == len(self._buffer):
+                # Fast path: a whole line usually arrives in a single frame,
+                # hand it back without going through the buffer
+                data = self._recv_frame(timeout=min(remaining_ns / 1e9, 0.1))
+                if data:
+                    nl = data.find(b"\n")
+                    if nl == len(data) - 1:
+                        return data
+                    self._buffer.clear()
+                    self._r = 0
+                    if nl != -1:
+                        self._buffer += memoryview(data)[nl + 1 :]
+                        return data[: nl + 1]
+                    self._buffer += data
+                continue
+
+            self._pull_data(timeout=min(remaining_ns / 1e9, 0.05))
+
+    def _skip_line(self, timeout: float = 0.5) -> bool:
+        """
+        Discard a single line from the internal buffer without copying it,
+        pulling from the websocket as needed.
+        Returns False if no complete line arrived before the timeout.
+        """
+        deadline_ns = _now() + int(timeout * 1e9)
+        while True:
+            idx = self._buffer.find(b"\n", self._r)
+            if idx != -1:
+                self._r = idx + 1
+                self._compact()
+                return True
+
+            remaining_ns = deadline_ns - _now()
+            if remaining_ns <= 0:
+                # Timeout – discard whatever partial data we have
+                self._buffer.clear()
+                self._r = 0
+                return False
+
+            self._pull_data(timeout=min(remaining_ns / 1e9, 0.05))
 
-    @property
-    def _in_waiting(self) -> int:
+    def _compact(self):
         """
-        Number of bytes sitting in the internal buffer (pulls pending
-        websocket frames first so the count is up-to-date).
+        Drop the already consumed part of the internal buffer once the
+        read offset gets large, instead of reslicing on every line.
         """
-        self._pull_data(timeout=0.05)
-        return len(self._buffer)
+        if self._r > 4096 or self._r > len(self._buffer) // 2:
+            del self._buffer[: self._r]
+            self._r = 0
 
     def start(self, wake_attempts: int = 10):
         """
@@ -84,26 +171,40 @@ class BusPirateWifi:
         """
         self.flush()
 
+        # Already sitting at a prompt, nothing to escape from
+        if self._at_prompt():
+            self.flush()
+            return
+
         # In case the Bus Pirate is in a mode/shell
-        self.send("n")
+        self.send_raw("n\n")
         self.wait()
-        self.send("1")
+        self.send_raw("1\n")
         self.wait()
 
         # Send newlines to escape a mode config or other cmd config
-        for _ in range(wake_attempts):
-            self.ws.send("\n")
+        self.send_raw("\n" * wake_attempts)
 
         self.wait()
         self.flush()
 
+    def _at_prompt(self, timeout: float = 0.2) -> bool:
+        """
+        Send a single newline and check whether the Bus Pirate answers
+        with its command prompt (last line ending with ">").
+        - timeout: time in seconds of silence to wait for the answer
+        """
+        self.send_raw("\n")
+        resp = self.receive_raw(silence_timeout=timeout)
+        return resp.rstrip().rsplit(b"\n", 1)[-1].endswith(b">")
+
     def change_mode(self, mode: str):
         """
         Change the Bus Pirate mode.
         - mode string: "I2C", "SPI", "UART", etc.
         """
-        self.send("m " + mode.lower())
-        self.send("\n" * 10)  # select the default configuration
+        self.send_raw(f"m {mode.lower()}\n")
+        self.send_raw("\n" * 10)  # select the default configuration
         self.wait()
         self.flush()
 
@@ -112,20 +213,17 @@ class BusPirateWifi:
         Clear the internal buffer and drain any pending websocket data.
         """
         self._buffer.clear()
+        self._r = 0
 
         # Drain pending websocket frames
-        old_timeout = self.ws.gettimeout()
-        self.ws.settimeout(0.1)
-        try:
-            while True:
-                try:
-                    data = self.ws.recv()
-                    if not data:
-                        break
-                except websocket.WebSocketTimeoutException:
+        self._set_timeout(0.1)
+        while True:
+            try:
+                data = self._ws_recv()
+                if not data:
                     break
-        finally:
-            self.ws.settimeout(old_timeout)
+            except websocket.WebSocketTimeoutException:
+                break
 
     def wait(self, delay: float = 0.3):
         """
@@ -139,9 +237,17 @@ class BusPirateWifi:
         Send a command or data to the Bus Pirate.
         - data: command data string to send
         """
-        if not data.endswith("\n"):
-            data += "\n"
-        self.ws.send(data)
+        if data.endswith("\n"):
+            self._ws_send(data)
+        else:
+            self._ws_send(data + "\n")
+
+    def send_raw(self, data: str | bytes):
+        """
+        Send data to the Bus Pirate as-is, without adding a newline.
+        - data: string or bytes, already terminated by the caller
+        """
+        self._ws_send(data)
 
     def receive(self, skip: int = 1, timeout: float = 0.5) -> list[str]:
         """
@@ -152,22 +258,26 @@ class BusPirateWifi:
         self.clear_echoes(skip)
 
         result = []
-        last_data_time = time.time()
+        timeout_ns = int(timeout * 1e9)
+        last_data_ns = _now()
 
         while True:
-            if self._in_waiting:
-                line = (
-                    self._readline(timeout=timeout)
-                    .decode("utf-8", errors="ignore")
-                    .strip()
-                )
+            line = self._readline(timeout=min(0.1, timeout), partial=False)
+            if not line and _now() - last_data_ns > timeout_ns:
+                # Silence – take whatever incomplete line is left
+                line = self._readline(timeout=0)
+                if not line:
+                    break
+            if line:
+                line = line.strip()
                 if line:
                     result.append(line)
-                last_data_time = time.time()
-            elif time.time() - last_data_time > timeout:
-                break
+                last_data_ns = _now()
 
-        return result[0:-1] if result and result[-1].endswith(">") else result
+        # Drop the trailing prompt before decoding anything
+        if result and result[-1].endswith(b">"):
+            result.pop()
+        return [line.decode("utf-8", errors="ignore") for line in result]
 
     def receive_all(self, silence_timeout: float = 0.5) -> list[str]:
         """
@@ -176,51 +286,92 @@ class BusPirateWifi:
           considering the transmission complete.
         """
         lines = []
-        last_data_time = time.time()
+        silence_ns = int(silence_timeout * 1e9)
+        last_data_ns = _now()
 
         while True:
-            if self._in_waiting > 0:
-                line = (
-                    self._readline(timeout=silence_timeout)
-                    .decode("utf-8", errors="ignore")
-                    .strip()
-                )
-                if line:
-                    if not line.endswith(">"):  # Ignore prompts
-                        lines.append(line)
-                    last_data_time = time.time()
-            else:
-                if time.time() - last_data_time > silence_timeout:
+            line = self._readline(timeout=min(0.1, silence_timeout), partial=False)
+            if not line and _now() - last_data_ns > silence_ns:
+                # Silence – take whatever incomplete line is left
+                line = self._readline(timeout=0)
+                if not line:
                     break
-                time.sleep(0.05)
+            if line:
+                line = line.strip()
+                if line:
+                    if not line.endswith(b">"):  # Ignore prompts
+                        lines.append(line.decode("utf-8", errors="ignore"))
+                    last_data_ns = _now()
 
         return lines
 
-    def receive_raw(self, silence_timeout: float = 0.5, max_bytes: int | None = None) -> bytes:
+    def receive_lines(self, timeout: float = 0.5) -> list[bytes]:
+        """
+        Receive every complete line currently available from the Bus Pirate.
+        - timeout: time in seconds to wait for at least one complete line
+        Returns: raw lines (bytes) without their trailing newline. An
+        incomplete last line stays buffered for the next read.
+        """
+        deadline_ns = _now() + int(timeout * 1e9)
+        scan = self._r
+        while self._buffer.find(b"\n", scan) == -1:
+            remaining_ns = deadline_ns - _now()
+            if remaining_ns <= 0:
+                return []
+            # Only the newly arrived bytes need scanning for a newline
+            scan = len(self._buffer)
+            self._pull_data(timeout=min(remaining_ns / 1e9, 0.05))
+
+        # Split everything received so far at once
+        lines = memoryview(self._buffer)[self._r :].tobytes().split(b"\n")
+        self._buffer.clear()
+        self._r = 0
+        self._buffer += lines.pop()
+        return lines
+
+    def receive_raw(
+        self,
+        silence_timeout: float = 0.5,
+        max_bytes: int | None = None,
+        out: bytearray | None = None,
+    ) -> bytes | int:
         """
         Receive raw bytes until silence_timeout seconds of silence.
         - silence_timeout: duration (s) without new data before stopping.
         - max_bytes: optional hard limit to avoid consuming too much data.
-        Returns: bytes (raw binary stream received).
+        - out: optional bytearray reused as storage across calls, cleared
+          and refilled in place.
+        Returns: bytes (raw binary stream received), or the number of bytes
+        written to `out` when it is supplied.
         """
-        buf = bytearray()
-        last_data_time = time.time()
+        if out is None:
+            buf = bytearray()
+        else:
+            buf = out
+            buf.clear()
 
-        while True:
-            self._pull_data(timeout=min(0.1, silence_timeout))
+        # Start with anything left over from line reads
+        buf += memoryview(self._buffer)[self._r :]
+        self._buffer.clear()
+        self._r = 0
+        silence_ns = int(silence_timeout * 1e9)
+        last_data_ns = _now()
 
-            if self._buffer:
-                chunk = bytes(self._buffer)
-                self._buffer.clear()
-                buf += chunk
-                last_data_time = time.time()
-                if max_bytes is not None and len(buf) >= max_bytes:
-                    return bytes(buf[:max_bytes])
+        while max_bytes is None or len(buf) < max_bytes:
+            before = len(buf)
+            self._pull_into(buf, timeout=min(0.1, silence_timeout))
+
+            if len(buf) > before:
+                last_data_ns = _now()
             else:
-                if time.time() - last_data_time > silence_timeout:
+                if _now() - last_data_ns > silence_ns:
                     break
 
-        return bytes(buf)
+        if out is not None:
+            if max_bytes is not None:
+                del out[max_bytes:]
+            return len(out)
+        return bytes(buf[:max_bytes]) if max_bytes is not None else bytes(buf)
 
     def clear_echoes(self, lines: int = 1):
         """
@@ -228,12 +379,18 @@ class BusPirateWifi:
         - lines: number of echoed lines to clear
         """
         for _ in range(lines):
-            self._readline(timeout=self.timeout)
+            self._skip_line(timeout=self.timeout)
 
     def stop(self):
         """
         Close the Bus Pirate WebSocket connection.
         """
+        try:
+            self._sel.unregister(self.ws.sock)
+            self._sel.close()
+        except Exception:
+            pass
+
         try:
             self.ws.close()
         except Exception:
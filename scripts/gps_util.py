@@ -1,10 +1,10 @@
 # Parse NMEA packets from a UBlox M10 GPS module hooked up to a Bus Pirate.
 
 from bus_pirate.bus_pirate_wifi import BusPirateWifi
-import time
-import os
-import pynmea2 # pip install pynmea2
+import sys
+from pynmea2 import parse as _parse, ParseError # pip install pynmea2
 from uart_connect_helper import connect_uart
+
 # Connect to the Bus Pirate
 bp = BusPirateWifi("192.168.0.57")
 bp.start()
@@ -19,14 +19,20 @@ print("GPS from UART started")
 
 try:
     while True:
-        lines = bp.receive(skip=0)
-        if lines:
-            for line in lines:
-                try:
-                    msg = pynmea2.parse(line + "\n")
-                    print(repr(msg))
-                except pynmea2.ParseError as e:
-                    pass
+        lines = bp.receive_lines()
+        for line in lines:
+            line = line.strip()
+            # Drop sentences without a checksum before the full parse
+            if line[-3:-2] != b"*":
+                continue
+            try:
+                # pynmea2 verifies the checksum, raising ChecksumError (a ParseError)
+                msg = _parse(line.decode("ascii", errors="ignore"))
+            except ParseError:
+                continue
+            sys.stdout.write(repr(msg))
+            sys.stdout.write("\n")
+        sys.stdout.flush()
 except KeyboardInterrupt:
     print("\nStopping GPS read...")
 finally:
@@ -6,19 +6,13 @@ def connect_uart(bp: BusPirate | BusPirateWifi, rx_pin: int, tx_pin: int,
     baudrate: int = 115200, bits = 8, parity = "N", stop = 1, inverted: bool = False):
     bp.send("mode uart")
     received = bp.receive()
-    if "Mode changed to UART" in received:
-        bp.send("config")
-    bp.send(f"{rx_pin}\n")
-    bp.send(f"{tx_pin}\n")
-    bp.send(f"{baudrate}\n")
-    bp.send(f"{bits}\n")
-    bp.send(f"{parity}\n")
-    bp.send(f"{stop}\n")
-    if inverted:
-        bp.send("y\n")
-    else:
-        bp.send("n\n")
-        
+    config = "config\n" if "Mode changed to UART" in received else ""
+    # Answer every config prompt in a single write
+    bp.send_raw(
+        f"{config}{rx_pin}\n{tx_pin}\n{baudrate}\n{bits}\n{parity}\n{stop}\n"
+        f"{'y' if inverted else 'n'}\n"
+    )
+
     bp.wait()
     print(bp.receive())
 